@@ -98,7 +98,7 @@ async function signBuyGroup(side, params) {
 
   const algod      = getAlgodClient();
   const sp         = await algod.getTransactionParams().do();
-  const methodName = side === 'YES' ? 'buy_yes' : 'buy_no';
+  const sideArg    = side === 'YES' ? 1 : 0;
 
   const sk     = decryptPrivateKey(encryptedKey);
   const signer = makeSigner(sk);
@@ -111,13 +111,13 @@ async function signBuyGroup(side, params) {
     suggestedParams: { ...sp, fee: 1000, flatFee: true },
   });
 
-  // txn[1]: ABI method call — buy_yes / buy_no (payment txn passed as arg)
+  // txn[1]: ABI method call — buy(side, payment) (payment txn passed as arg)
   const atc = new algosdk.AtomicTransactionComposer();
 
   atc.addMethodCall({
     appID:           appId,
-    method:          getMethod(methodName),
-    methodArgs:      [{ txn: payTxn, signer }],
+    method:          getMethod('buy'),
+    methodArgs:      [sideArg, { txn: payTxn, signer }],
     sender:          fromAddress,
     suggestedParams: { ...sp, fee: 2000, flatFee: true },
     signer,
@@ -251,8 +251,25 @@ async function signAsaOptIn(params) {
 
 // ── On-chain helpers ───────────────────────────────────────────────────────────
 
+// On-chain 1-byte global state key tags → readable names.
+// Must match STATE_KEYS in contracts/config.py.
+const STATE_KEY_NAMES = {
+  q: 'question',
+  c: 'creator',
+  m: 'multisig',
+  t: 'close_ts',
+  y: 'yes_asa_id',
+  n: 'no_asa_id',
+  Y: 'yes_reserve',
+  N: 'no_reserve',
+  r: 'resolved',
+  o: 'outcome',
+};
+
 /**
  * Read the global state of a deployed market application.
+ * Keys are returned by readable name; apps deployed before the 1-byte tags
+ * already use those names and pass through unchanged.
  * @param {number} appId
  * @returns {Promise<object>} decoded state dict
  */
@@ -262,7 +279,8 @@ async function readMarketState(appId) {
   const raw   = info.params['global-state'] || [];
   const state = {};
   for (const item of raw) {
-    const key = Buffer.from(item.key, 'base64').toString('utf8');
+    const tag = Buffer.from(item.key, 'base64').toString('utf8');
+    const key = STATE_KEY_NAMES[tag] || tag;
     const val = item.value;
     state[key] = val.type === 1
       ? Buffer.from(val.bytes, 'base64')
@@ -4,21 +4,22 @@ app.py — CastAlgo Market Smart Contract (ARC-4 ABI via PyTeal Router)
 One application instance is deployed per prediction market.
 The deployer (backend server wallet) is the market creator.
 
-Global State (9 slots: 2 bytes + 7 ints):
-  question    → bytes  : market question text
-  creator     → bytes  : deployer address (admin)
-  close_ts    → uint64 : unix timestamp after which trading stops
-  yes_asa_id  → uint64 : YES token ASA ID
-  no_asa_id   → uint64 : NO token ASA ID
-  yes_reserve → uint64 : total microAlgos deposited to buy YES
-  no_reserve  → uint64 : total microAlgos deposited to buy NO
-  resolved    → uint64 : 0 = open, 1 = resolved
-  outcome     → uint64 : 0 = NO wins, 1 = YES wins (valid only when resolved=1)
+Global State (10 slots: 3 bytes + 7 ints; on-chain key tag in brackets,
+see config.STATE_KEYS):
+  question    [q] → bytes  : market question text
+  creator     [c] → bytes  : deployer address (admin)
+  multisig    [m] → bytes  : 2-of-3 admin multisig address (may also resolve)
+  close_ts    [t] → uint64 : unix timestamp after which trading stops
+  yes_asa_id  [y] → uint64 : YES token ASA ID
+  no_asa_id   [n] → uint64 : NO token ASA ID
+  yes_reserve [Y] → uint64 : total microAlgos deposited to buy YES
+  no_reserve  [N] → uint64 : total microAlgos deposited to buy NO
+  resolved    [r] → uint64 : 0 = open, 1 = resolved
+  outcome     [o] → uint64 : 0 = NO wins, 1 = YES wins (valid only when resolved=1)
 
 ABI Methods:
   create_market(question: string, close_ts: uint64) → void
-  buy_yes(payment: pay) → uint64          (returns tokens issued)
-  buy_no(payment: pay)  → uint64
+  buy(side: uint64, payment: pay) → uint64   (side 1 = YES, 0 = NO; returns tokens issued)
   resolve_market(outcome: uint64) → void
   claim() → uint64                        (returns payout in microAlgos)
 
@@ -30,13 +31,18 @@ Outputs:
   contracts/build/contract.json
 """
 
+import hashlib
 import json
 import os
+from importlib import metadata
 import pyteal as pt
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional; stdlib json is used as a fallback
+
 from config import (
-    ASA_TOTAL_SUPPLY,
-    ASA_DECIMALS,
     GLOBAL_BYTES,
     GLOBAL_INTS,
     LOCAL_BYTES,
@@ -56,8 +62,7 @@ from market_logic import (
     KEY_OUTCOME,
     KEY_CREATOR,
     KEY_MULTISIG,
-    handle_buy_yes,
-    handle_buy_no,
+    handle_buy,
     handle_resolve,
     handle_claim,
 )
@@ -87,7 +92,8 @@ def create_market(
     Protected by a close_ts == 0 guard so it can never be called twice.
     multisig_addr: the 2-of-3 admin multisig address authorised to resolve.
     """
-    app_addr = pt.Global.current_application_address()
+    # Read once, reused by both ASA creations below
+    app_addr = pt.ScratchVar(pt.TealType.bytes)
 
     return pt.Seq(
         # Guard: can only be called once (close_ts starts at 0)
@@ -108,99 +114,53 @@ def create_market(
         pt.App.globalPut(KEY_OUTCOME,     pt.Int(0)),
 
         # Fund contract with inner txn fee budget (caller must pre-fund via payment group)
-        # Create YES ASA
-        create_asa(
-            name=pt.Bytes("CastAlgo YES"),
-            unit_name=pt.Bytes("YES"),
-            total=pt.Int(ASA_TOTAL_SUPPLY),
-            decimals=pt.Int(ASA_DECIMALS),
-            manager=app_addr,
-            reserve=app_addr,
-            clawback=app_addr,   # Contract is clawback → enables burn
-            freeze=pt.Global.zero_address(),
-        ),
-        pt.App.globalPut(KEY_YES_ASA, pt.InnerTxn.created_asset_id()),
-
-        # Create NO ASA
-        create_asa(
-            name=pt.Bytes("CastAlgo NO"),
-            unit_name=pt.Bytes("NO"),
-            total=pt.Int(ASA_TOTAL_SUPPLY),
-            decimals=pt.Int(ASA_DECIMALS),
-            manager=app_addr,
-            reserve=app_addr,
-            clawback=app_addr,
-            freeze=pt.Global.zero_address(),
-        ),
-        pt.App.globalPut(KEY_NO_ASA, pt.InnerTxn.created_asset_id()),
+        # Create YES + NO ASAs as one inner group (itxn_next) so they share a submit
+        app_addr.store(pt.Global.current_application_address()),
+        pt.InnerTxnBuilder.Begin(),
+        create_asa(name=pt.Bytes("CastAlgo YES"), unit_name=pt.Bytes("YES"), app_addr=app_addr.load()),
+        pt.InnerTxnBuilder.Next(),
+        create_asa(name=pt.Bytes("CastAlgo NO"), unit_name=pt.Bytes("NO"), app_addr=app_addr.load()),
+        pt.InnerTxnBuilder.Submit(),
+        pt.App.globalPut(KEY_YES_ASA, pt.Gitxn[0].created_asset_id()),
+        pt.App.globalPut(KEY_NO_ASA,  pt.Gitxn[1].created_asset_id()),
 
         pt.Approve(),
     )
 
 
-# ── buy_yes ───────────────────────────────────────────────────────────────────
+# ── buy ───────────────────────────────────────────────────────────────────────
 
 @router.method
-def buy_yes(
+def buy(
+    side: pt.abi.Uint64,
     payment: pt.abi.PaymentTransaction,
     *,
     output: pt.abi.Uint64,
 ) -> pt.Expr:
     """
     Atomic group: [pay txn → contract] + [this app call].
-    Validates payment, updates yes_reserve, sends YES tokens to buyer.
+    side: 1 = YES, 0 = NO.
+    Validates payment, updates the side's reserve, sends its tokens to buyer.
     Returns number of tokens issued.
     """
     pay_txn = payment.get()
-    amount  = pay_txn.amount()
-    buyer   = pay_txn.sender()
-
-    tokens = pt.ScratchVar(pt.TealType.uint64)
-
-    return pt.Seq(
-        pt.Assert(
-            pay_txn.receiver() == pt.Global.current_application_address(),
-            comment="payment must go to contract",
-        ),
-        pt.Assert(
-            pay_txn.sender() == pt.Txn.sender(),
-            comment="payment sender must match caller",
-        ),
-        handle_buy_yes(amount, buyer),
-        tokens.store(amount),   # 1:1 hackathon pricing
-        output.set(tokens.load()),
-    )
-
-
-# ── buy_no ────────────────────────────────────────────────────────────────────
-
-@router.method
-def buy_no(
-    payment: pt.abi.PaymentTransaction,
-    *,
-    output: pt.abi.Uint64,
-) -> pt.Expr:
-    """
-    Mirror of buy_yes for NO tokens.
-    """
-    pay_txn = payment.get()
-    amount  = pay_txn.amount()
-    buyer   = pay_txn.sender()
-
-    tokens = pt.ScratchVar(pt.TealType.uint64)
+    buyer   = pt.Txn.sender()   # == pay_txn.sender(), asserted below; saves a gtxns
+    # Read once, reused by the amount check, reserve update, mint and return
+    amount  = pt.ScratchVar(pt.TealType.uint64)
 
     return pt.Seq(
+        pt.Assert(side.get() <= pt.Int(1), comment="side must be 0 or 1"),
+        amount.store(pay_txn.amount()),
         pt.Assert(
             pay_txn.receiver() == pt.Global.current_application_address(),
             comment="payment must go to contract",
         ),
         pt.Assert(
-            pay_txn.sender() == pt.Txn.sender(),
+            pay_txn.sender() == buyer,
             comment="payment sender must match caller",
         ),
-        handle_buy_no(amount, buyer),
-        tokens.store(amount),
-        output.set(tokens.load()),
+        handle_buy(side.get(), amount.load(), buyer),
+        output.set(amount.load()),   # 1:1 hackathon pricing
     )
 
 
@@ -226,32 +186,95 @@ def claim(*, output: pt.abi.Uint64) -> pt.Expr:
     Burns winning tokens via clawback and pays out ALGO 1:1.
     Returns payout amount in microAlgos.
     """
-    # Store payout for return value
-    payout = pt.ScratchVar(pt.TealType.uint64)
     outcome = pt.App.globalGet(KEY_OUTCOME)
-    winning_asa = pt.If(outcome == pt.Int(1))                   \
-                    .Then(pt.App.globalGet(KEY_YES_ASA))        \
-                    .Else(pt.App.globalGet(KEY_NO_ASA))
-
-    balance_val = pt.AssetHolding.balance(pt.Txn.sender(), winning_asa)
+    # Resolved once here and shared with handle_claim
+    winning_asa = pt.ScratchVar(pt.TealType.uint64)
 
     return pt.Seq(
-        handle_claim(pt.Txn.sender()),
-        balance_val,   # load before claim burns tokens (for return value)
-        payout.store(balance_val.value()),
-        output.set(payout.load()),
+        winning_asa.store(
+            pt.If(outcome == pt.Int(1))
+            .Then(pt.App.globalGet(KEY_YES_ASA))
+            .Else(pt.App.globalGet(KEY_NO_ASA))
+        ),
+        # handle_claim evaluates to the pre-burn balance it paid out
+        output.set(handle_claim(pt.Txn.sender(), winning_asa.load())),
     )
 
 
 # ── Compile ───────────────────────────────────────────────────────────────────
 
-def compile_contract() -> None:
-    """Compile approval + clear programs and write ABI JSON."""
+_here = os.path.dirname(os.path.abspath(__file__))
+
+# PyTeal sources that feed the compiled TEAL / ABI output
+_CONTRACT_SOURCES = [
+    os.path.join(_here, name)
+    for name in ("app.py", "market_logic.py", "asa_utils.py", "config.py")
+]
+
+# Everything besides the sources that changes the generated TEAL / ABI
+_COMPILE_OPTIONS = {
+    "version": 10,
+    # Pack repeated int/byte literals into intcblock/bytecblock (intc_0, bytec_1 …)
+    "assemble_constants": True,
+    "scratch_slots": True,
+    # frame_pointers keeps ABI args/locals on the stack instead of scratch
+    "frame_pointers": True,
+}
+
+# Digest of the inputs the build outputs were generated from.  Written next
+# to the outputs, so each set of artifacts carries its own stamp.
+_BUILD_STAMP = os.path.join(os.path.dirname(APPROVAL_TEAL), ".build-stamp")
+
+# Set once this process has written the build outputs
+_COMPILED_ONCE = False
+
+
+def _build_digest() -> str:
+    """sha256 over the PyTeal version, compile options and contract sources."""
+    h = hashlib.sha256()
+    h.update(metadata.version("pyteal").encode())
+    h.update(json.dumps(_COMPILE_OPTIONS, sort_keys=True).encode())
+    for src in _CONTRACT_SOURCES:
+        with open(src, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def build_is_fresh() -> bool:
+    """
+    True if the TEAL/ABI build outputs exist and their stamp matches the
+    current sources, PyTeal version and compile options.
+    """
+    outputs = (APPROVAL_TEAL, CLEAR_TEAL, ABI_JSON)
+    if not all(os.path.exists(p) for p in outputs):
+        return False
+    try:
+        with open(_BUILD_STAMP) as f:
+            return f.read().strip() == _build_digest()
+    except OSError:
+        return False
+
+
+def compile_contract(force: bool = False) -> bool:
+    """
+    Compile approval + clear programs and write ABI JSON.
+    Skips the PyTeal lowering when the outputs are already up to date (or were
+    written earlier in this process) unless `force` is set.
+    Returns True if the outputs were (re)written.
+    """
+    global _COMPILED_ONCE
+    if not force and (_COMPILED_ONCE or build_is_fresh()) and os.path.exists(APPROVAL_TEAL):
+        return False
+
     import algosdk
 
     approval_program, clear_program, contract = router.compile_program(
-        version=8,
-        optimize=pt.OptimizeOptions(scratch_slots=True),
+        version=_COMPILE_OPTIONS["version"],
+        assemble_constants=_COMPILE_OPTIONS["assemble_constants"],
+        optimize=pt.OptimizeOptions(
+            scratch_slots=_COMPILE_OPTIONS["scratch_slots"],
+            frame_pointers=_COMPILE_OPTIONS["frame_pointers"],
+        ),
     )
 
     os.makedirs("contracts/build", exist_ok=True)
@@ -264,10 +287,20 @@ def compile_contract() -> None:
         f.write(clear_program)
     print(f"[OK] Clear TEAL written to {CLEAR_TEAL}")
 
-    with open(ABI_JSON, "w") as f:
-        f.write(json.dumps(contract.dictify(), indent=2))
+    if orjson is not None:
+        with open(ABI_JSON, "wb") as f:
+            f.write(orjson.dumps(contract.dictify(), option=orjson.OPT_INDENT_2))
+    else:
+        with open(ABI_JSON, "w") as f:
+            f.write(json.dumps(contract.dictify(), indent=2))
     print(f"[OK] ABI JSON written to {ABI_JSON}")
 
+    with open(_BUILD_STAMP, "w") as f:
+        f.write(_build_digest())
+
+    _COMPILED_ONCE = True
+    return True
+
 
 if __name__ == "__main__":
-    compile_contract()
+    compile_contract(force=True)
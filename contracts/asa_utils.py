@@ -5,45 +5,63 @@ Called by the smart contract (inner transactions) and by deploy.py.
 
 import pyteal as pt
 
+from config import ASA_TOTAL_SUPPLY, ASA_DECIMALS
+
 
 # ── Inner transaction: create an ASA ──────────────────────────────────────────
 
+@pt.Subroutine(pt.TealType.none)
+def _set_common_asa_fields(app_addr: pt.Expr) -> pt.Expr:
+    """
+    Sets the AssetConfig fields shared by every market ASA (supply, decimals,
+    contract as manager/reserve/clawback, no freeze) on the inner txn being
+    built.  A subroutine so the itxn_field sequence is emitted only once;
+    `app_addr` is passed in so the caller reads the app address once.
+    """
+    return pt.InnerTxnBuilder.SetFields(
+        {
+            pt.TxnField.type_enum:      pt.TxnType.AssetConfig,
+            pt.TxnField.config_asset_total:     pt.Int(ASA_TOTAL_SUPPLY),
+            pt.TxnField.config_asset_decimals:  pt.Int(ASA_DECIMALS),
+            pt.TxnField.config_asset_manager:   app_addr,
+            pt.TxnField.config_asset_reserve:   app_addr,
+            pt.TxnField.config_asset_clawback:  app_addr,   # Contract is clawback → enables burn
+            pt.TxnField.config_asset_freeze:    pt.Global.zero_address(),
+            pt.TxnField.fee:                    pt.Int(0),
+        }
+    )
+
+
 def create_asa(
     name: pt.Expr,
     unit_name: pt.Expr,
-    total: pt.Expr,
-    decimals: pt.Expr,
-    manager: pt.Expr,
-    reserve: pt.Expr,
-    clawback: pt.Expr,
-    freeze: pt.Expr,
+    app_addr: pt.Expr,
 ) -> pt.Expr:
     """
-    Returns a PyTeal expression that submits an inner AssetConfig transaction
-    to create a new ASA.  Returns the newly created asset ID via
-    `pt.InnerTxn.created_asset_id()` after execution.
+    Returns a PyTeal expression that fills in an inner AssetConfig transaction
+    creating a new ASA, with `app_addr` (the contract address, read once by the
+    caller) as manager/reserve/clawback.  It does not begin or submit the
+    transaction, so several creations can share one inner group:
 
     Usage:
         pt.Seq(
-            pt.InnerTxnBuilder.Execute(create_asa_fields(...)),
-            created_id := pt.InnerTxn.created_asset_id(),
+            app_addr.store(pt.Global.current_application_address()),
+            pt.InnerTxnBuilder.Begin(),
+            create_asa(pt.Bytes("CastAlgo YES"), pt.Bytes("YES"), app_addr.load()),
+            pt.InnerTxnBuilder.Next(),
+            create_asa(pt.Bytes("CastAlgo NO"), pt.Bytes("NO"), app_addr.load()),
+            pt.InnerTxnBuilder.Submit(),
+            yes_id := pt.Gitxn[0].created_asset_id(),
         )
     """
     return pt.Seq(
-        pt.InnerTxnBuilder.Execute(
+        _set_common_asa_fields(app_addr),
+        pt.InnerTxnBuilder.SetFields(
             {
-                pt.TxnField.type_enum:      pt.TxnType.AssetConfig,
-                pt.TxnField.config_asset_total:     total,
-                pt.TxnField.config_asset_decimals:  decimals,
                 pt.TxnField.config_asset_name:      name,
                 pt.TxnField.config_asset_unit_name: unit_name,
-                pt.TxnField.config_asset_manager:   manager,
-                pt.TxnField.config_asset_reserve:   reserve,
-                pt.TxnField.config_asset_clawback:  clawback,
-                pt.TxnField.config_asset_freeze:    freeze,
-                pt.TxnField.fee:                    pt.Int(0),
             }
-        )
+        ),
     )
 
 
@@ -34,12 +34,18 @@ INDEXER_TOKEN = os.getenv("ALGORAND_INDEXER_TOKEN", "")
 # In production this is the server wallet (funded on TestNet).
 # For LocalNet, this will be retrieved from KMD automatically.
 
-DEPLOYER_MNEMONIC = os.getenv("DEPLOYER_MNEMONIC", "")
+# Read at call time (not import time) so a load_dotenv() that runs after this
+# module is first imported is still honoured.
+
+def deployer_mnemonic() -> str:
+    return os.getenv("DEPLOYER_MNEMONIC", "")
 
 # ── Multisig address ───────────────────────────────────────────────────────────
 # The 2-of-3 admin multisig address authorised to resolve markets.
 # Falls back to DEPLOYER_ADDRESS for single-admin / LocalNet setups.
-MULTISIG_ADDRESS = os.getenv("MULTISIG_ADDRESS", "") or os.getenv("DEPLOYER_ADDRESS", "")
+
+def multisig_address() -> str:
+    return os.getenv("MULTISIG_ADDRESS", "") or os.getenv("DEPLOYER_ADDRESS", "")
 
 # ── Contract constants ─────────────────────────────────────────────────────────
 
@@ -53,9 +59,34 @@ ASA_TOTAL_SUPPLY = 1_000_000_000  # 1 billion smallest units
 # ASA decimals — 0 means 1 token = 1 unit (no fractional tokens)
 ASA_DECIMALS = 0
 
-# Global state byte-slices used by the contract (schema declaration)
-GLOBAL_BYTES   = 3   # question, creator, multisig
-GLOBAL_INTS    = 7   # close_ts, yes_asa_id, no_asa_id, yes_reserve, no_reserve, resolved, outcome
+# On-chain global state keys.  Each key is pushed as a literal by every
+# app_global_get/put, so 1-byte tags keep the approval program small.
+# Off-chain readers (deploy._decode_state, backend readMarketState) map the
+# tags back to these names.
+STATE_KEYS = {
+    "question":    "q",
+    "creator":     "c",
+    "multisig":    "m",
+    "close_ts":    "t",
+    "yes_asa_id":  "y",
+    "no_asa_id":   "n",
+    "yes_reserve": "Y",
+    "no_reserve":  "N",
+    "resolved":    "r",
+    "outcome":     "o",
+}
+
+# STATE_KEYS entries holding byte-slices; every other key is a uint64
+BYTES_STATE_KEYS = frozenset({"question", "creator", "multisig"})
+if not BYTES_STATE_KEYS <= STATE_KEYS.keys():
+    raise ValueError(
+        f"BYTES_STATE_KEYS not in STATE_KEYS: {sorted(BYTES_STATE_KEYS - STATE_KEYS.keys())}"
+    )
+
+# Global state schema, derived from STATE_KEYS (the contract's market_logic
+# KEY_* constants are built from it, so a new key updates the schema too)
+GLOBAL_BYTES   = len(BYTES_STATE_KEYS)
+GLOBAL_INTS    = len(STATE_KEYS) - GLOBAL_BYTES
 
 # Local state (per-user opt-in) — not used in custodial model, keep minimal
 LOCAL_BYTES = 0
@@ -65,3 +96,8 @@ LOCAL_INTS  = 0
 APPROVAL_TEAL = "contracts/build/approval.teal"
 CLEAR_TEAL    = "contracts/build/clear.teal"
 ABI_JSON      = "contracts/build/contract.json"
+
+# Assembled bytecode cache, keyed by sha256 of the TEAL source.
+# Anchored to this directory so runs from the repo root and from contracts/
+# (as the backend spawns deploy.py) share one cache.
+TEAL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".teal-cache")
@@ -7,9 +7,9 @@ Usage:
 This script:
   1. Compiles the contract (approval + clear TEAL)
   2. Deploys a new application to Algorand TestNet
-  3. Funds the contract with minimum balance
-  4. Calls create_market() to initialize state + mint YES/NO ASAs
-  5. Prints app_id, yes_asa_id, no_asa_id  → store these in your DB
+  3. Funds the contract with minimum balance and calls create_market() to
+     initialize state + mint YES/NO ASAs, as one atomic group
+  4. Prints app_id, yes_asa_id, no_asa_id  → store these in your DB
 
 Requirements:
   pip install pyteal==0.26.1 py-algorand-sdk
@@ -18,10 +18,15 @@ Requirements:
 
 import argparse
 import base64
+import copy
+import functools
+import hashlib
 import json
 import time
 import os
 import sys
+from binascii import a2b_base64
+from concurrent.futures import ThreadPoolExecutor
 
 # ── Load .env BEFORE importing config (so os.getenv picks up values) ──────────
 _here = os.path.dirname(os.path.abspath(__file__))
@@ -32,6 +37,11 @@ try:
 except ImportError:
     pass  # python-dotenv optional; env vars can be set manually
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional; stdlib json is used as a fallback
+
 # Allow running from repo root or contracts/
 sys.path.insert(0, os.path.dirname(__file__))
 
@@ -48,12 +58,14 @@ from config import (
     KMD_URL,
     KMD_TOKEN,
     NETWORK,
-    DEPLOYER_MNEMONIC,
-    MULTISIG_ADDRESS,
+    deployer_mnemonic,
+    multisig_address,
     MIN_BALANCE_BUFFER,
     APPROVAL_TEAL,
     CLEAR_TEAL,
     ABI_JSON,
+    STATE_KEYS,
+    TEAL_CACHE_DIR,
     GLOBAL_BYTES,
     GLOBAL_INTS,
     LOCAL_BYTES,
@@ -67,9 +79,11 @@ def get_algod() -> algod_client.AlgodClient:
     return algod_client.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
 
 
+@functools.lru_cache(maxsize=1)
 def get_localnet_account() -> tuple[str, str]:
     """
     Retrieve the funded LocalNet dispenser account from KMD.
+    Cached: the five KMD round-trips run once per process.
     Returns: (private_key, address)
     """
     if not KMD_URL or not KMD_TOKEN:
@@ -105,20 +119,32 @@ def get_localnet_account() -> tuple[str, str]:
     return private_key, address
 
 
-def get_deployer_credentials() -> tuple[str, str]:
+@functools.lru_cache(maxsize=4)
+def _resolve_deployer(mn: str) -> tuple:
+    """Mnemonic → (private_key, address, signer); key derivation runs once per mnemonic."""
+    private_key = mnemonic.to_private_key(mn)
+    return (
+        private_key,
+        account.address_from_private_key(private_key),
+        algosdk.atomic_transaction_composer.AccountTransactionSigner(private_key),
+    )
+
+
+def get_deployer_credentials() -> tuple:
     """
-    Get deployer private key and address based on network.
-    Returns: (private_key, address)
+    Get deployer private key, address and transaction signer based on network.
+    Returns: (private_key, address, signer)
     """
     if ALGOD_NETWORK == "local":
         print("[i] Using LocalNet - retrieving dispenser account from KMD...")
-        return get_localnet_account()
+        private_key, address = get_localnet_account()
+        signer = algosdk.atomic_transaction_composer.AccountTransactionSigner(private_key)
+        return private_key, address, signer
     else:
-        if not DEPLOYER_MNEMONIC:
+        deployer_mn = deployer_mnemonic()
+        if not deployer_mn:
             raise ValueError("DEPLOYER_MNEMONIC not set in .env for TestNet")
-        private_key = mnemonic.to_private_key(DEPLOYER_MNEMONIC)
-        address = account.address_from_private_key(private_key)
-        return private_key, address
+        return _resolve_deployer(deployer_mn)
 
 
 def check_balance(algod: algod_client.AlgodClient, address: str) -> int:
@@ -133,21 +159,80 @@ def check_balance(algod: algod_client.AlgodClient, address: str) -> int:
     return balance_microalgos
 
 
+def _json_loads(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_dumps_pretty(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
 def compile_teal(algod: algod_client.AlgodClient, teal_src: str) -> bytes:
+    """
+    Assemble TEAL via algod.  The bytecode is cached on disk keyed by the
+    source hash, so identical programs skip the /v2/teal/compile round-trip.
+
+    Assembly is deliberately left to algod rather than an in-process
+    assembler: a mis-encoded opcode would still deploy, just as a broken
+    contract.  With the cache, algod is hit once per distinct program source.
+    """
+    key = hashlib.sha256(teal_src.encode()).hexdigest()
+    cache_path = os.path.join(TEAL_CACHE_DIR, f"{key}.bin")
+    if os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            return f.read()
+
     response = algod.compile(teal_src)
-    return base64.b64decode(response["result"])
+    program = base64.b64decode(response["result"])
+
+    os.makedirs(TEAL_CACHE_DIR, exist_ok=True)
+    with open(cache_path, "wb") as f:
+        f.write(program)
+    return program
+
+
+@functools.lru_cache(maxsize=4)
+def _load_abi(path: str, mtime: float):
+    """
+    Parse an ARC-4 contract JSON once and index its methods by name.
+    Keyed on mtime as well as path so a recompiled contract.json is re-read.
+    """
+    with open(path, "rb") as f:
+        contract = algosdk.abi.Contract.undictify(_json_loads(f.read()))
+    return contract, {m.name: m for m in contract.methods}
 
 
-def wait_for_confirmation(algod: algod_client.AlgodClient, txid: str) -> dict:
-    last_round = algod.status()["last-round"]
-    while True:
+def wait_for_confirmation(
+    algod: algod_client.AlgodClient,
+    txid: str,
+    wait_rounds: int = 10,
+) -> dict:
+    """
+    Wait for `txid` to confirm, long-polling algod round by round.
+    The pending pool is checked first, so an already-confirmed txn (common on
+    LocalNet dev mode) costs one call; on a miss, status_after_block blocks
+    server-side until the next round before checking again.
+    Raises if not confirmed within `wait_rounds` rounds.
+
+    status_after_block is algod's block notification (it has no WebSocket
+    stream); waiting on the indexer instead would only add its ingest lag.
+    """
+    last_round = None
+    for attempt in range(wait_rounds + 1):
         txn_info = algod.pending_transaction_info(txid)
         if txn_info.get("confirmed-round", 0) > 0:
             return txn_info
         if txn_info.get("pool-error"):
             raise Exception(f"Transaction rejected: {txn_info['pool-error']}")
-        algod.status_after_block(last_round + 1)
+        if attempt == wait_rounds:
+            break
+        if last_round is None:
+            last_round = algod.status()["last-round"]
+        algod.status_after_block(last_round)
         last_round += 1
+    raise Exception(f"Transaction {txid} not confirmed after {wait_rounds} rounds")
 
 
 # ── Deploy ─────────────────────────────────────────────────────────────────────
@@ -157,9 +242,10 @@ def deploy_market(question: str, close_ts: int) -> dict:
     Full deployment flow:
       1. Compile contract
       2. Bare ApplicationCreate (no method call)
-      3. Fund app with min-balance (so inner txns in step 4 can pay fees)
-      4. Call create_market() as a regular NoOp ABI call
-      5. Read YES/NO ASA IDs from global state
+      3. Atomic group: fund app with min-balance + create_market() ABI call
+         (the payment executes first, covering the min-balance for 2 ASAs;
+          all fees are pooled onto the create_market call)
+      4. Read YES/NO ASA IDs from global state
     Returns: { app_id, app_address, yes_asa_id, no_asa_id }
     """
     # ── Network & Account Setup ────────────────────────────────────────────────
@@ -171,7 +257,7 @@ def deploy_market(question: str, close_ts: int) -> dict:
     algod = get_algod()
     
     # Get deployer credentials (KMD for LocalNet, mnemonic for TestNet)
-    deployer_pk, deployer_addr = get_deployer_credentials()
+    deployer_pk, deployer_addr, signer = get_deployer_credentials()
     print(f"[i] Deployer: {deployer_addr}")
     
     # Check balance
@@ -185,27 +271,30 @@ def deploy_market(question: str, close_ts: int) -> dict:
         )
     
     print(f"\n✅ Connection confirmed - proceeding with deployment...\n")
-    
-    sp = algod.suggested_params()
-    sp.fee = 1000
-    sp.flat_fee = True
 
     # ── Step 1: Compile ────────────────────────────────────────────────────────
     print("[1] Compiling contract...")
-    compile_contract()
+    if not compile_contract():
+        print("[i] Contract build is up to date, skipped PyTeal compile")
 
     with open(APPROVAL_TEAL) as f:
         approval_src = f.read()
     with open(CLEAR_TEAL) as f:
         clear_src = f.read()
-    with open(ABI_JSON) as f:
-        abi = json.load(f)
 
-    approval_bytes = compile_teal(algod, approval_src)
-    clear_bytes    = compile_teal(algod, clear_src)
+    # Assemble both programs (algod round-trip each on a cache miss) while
+    # fetching suggested params.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        approval_future = pool.submit(compile_teal, algod, approval_src)
+        clear_future    = pool.submit(compile_teal, algod, clear_src)
+        sp = algod.suggested_params()
+        sp.fee = 1000
+        sp.flat_fee = True
+        approval_bytes = approval_future.result()
+        clear_bytes    = clear_future.result()
 
     # ── Step 2: Bare ApplicationCreate ────────────────────────────────────────
-    # No ABI method in this txn; create_market called separately after funding.
+    # No ABI method in this txn; create_market is grouped with the funding below.
     print("[2] Creating application (bare create)...")
     create_txn = transaction.ApplicationCreateTxn(
         sender=deployer_addr,
@@ -226,43 +315,47 @@ def deploy_market(question: str, close_ts: int) -> dict:
     signed_create = create_txn.sign(deployer_pk)
     txid          = algod.send_transaction(signed_create)
     print(f"    tx: {txid}")
-    result      = wait_for_confirmation(algod, txid)
+    result      = wait_for_confirmation(algod, txid, wait_rounds=4)
     app_id      = result["application-index"]
     app_address = algosdk.logic.get_application_address(app_id)
     print(f"[OK] App ID: {app_id}  Address: {app_address}")
 
-    # ── Step 3: Fund contract min-balance ──────────────────────────────────────
-    # Must fund BEFORE create_market so inner txns (ASA creation) can pay fees.
-    # 0.1 ALGO base + 2×0.1 ASA slots + 3×fee buffer = 0.5 ALGO minimum.
-    print("[3] Funding contract min-balance…")
-    fund_txn = transaction.PaymentTxn(
-        sender=deployer_addr,
-        sp=sp,
-        receiver=app_address,
-        amt=MIN_BALANCE_BUFFER,
-    )
-    signed_fund = fund_txn.sign(deployer_pk)
-    fund_txid   = algod.send_transaction(signed_fund)
-    wait_for_confirmation(algod, fund_txid)
-    print(f"[OK] Funded {MIN_BALANCE_BUFFER} microAlgos -> {app_address}")
-
-    # ── Step 4: Call create_market() ABI method ──────────────────────────────
-    print("[4] Calling create_market()...")
-    # Fee = 1 outer + 2 inner txns (YES ASA + NO ASA) = 3000 microAlgos
-    sp_init = algod.suggested_params()
-    sp_init.fee      = 3000
+    # ── Step 3: Fund + create_market() in one atomic group ────────────────────
+    # The payment runs before the app call within the group, so the contract
+    # holds its min-balance by the time create_market's inner txns execute.
+    # 0.1 ALGO base + 2×0.1 ASA slots = 0.3 ALGO minimum, plus buffer → 0.5 ALGO.
+    # Inner txns carry fee 0, so the contract balance never pays fees.
+    print("[3] Funding contract + calling create_market() (one group)...")
+    # Fees are pooled across the group: the funding payment pays 0 and
+    # create_market covers 1 fund + 1 outer + 2 inner (YES + NO ASA) = 4000.
+    sp_fund = copy.copy(sp)
+    sp_fund.fee      = 0
+    sp_fund.flat_fee = True
+
+    # Same validity window as the create txn (~1000 rounds), so no re-fetch
+    sp_init = copy.copy(sp)
+    sp_init.fee      = 4000
     sp_init.flat_fee = True
 
-    contract_abi  = algosdk.abi.Contract.from_json(json.dumps(abi))
-    create_method = next(m for m in contract_abi.methods if m.name == "create_market")
-    signer        = algosdk.atomic_transaction_composer.AccountTransactionSigner(deployer_pk)
+    _, abi_methods = _load_abi(ABI_JSON, os.path.getmtime(ABI_JSON))
+    create_method  = abi_methods["create_market"]
 
     # Resolve the multisig address: use MULTISIG_ADDRESS env var if set,
     # otherwise fall back to the deployer's own address (single-admin mode).
-    multisig_addr = MULTISIG_ADDRESS if MULTISIG_ADDRESS else deployer_addr
+    multisig_addr = multisig_address() or deployer_addr
     print(f"[i] Multisig/resolver address: {multisig_addr}")
 
+    fund_txn = transaction.PaymentTxn(
+        sender=deployer_addr,
+        sp=sp_fund,
+        receiver=app_address,
+        amt=MIN_BALANCE_BUFFER,
+    )
+
     atc = algosdk.atomic_transaction_composer.AtomicTransactionComposer()
+    atc.add_transaction(
+        algosdk.atomic_transaction_composer.TransactionWithSigner(fund_txn, signer)
+    )
     atc.add_method_call(
         app_id=app_id,
         method=create_method,
@@ -272,10 +365,15 @@ def deploy_market(question: str, close_ts: int) -> dict:
         method_args=[question, close_ts, multisig_addr],
     )
 
-    result_atc = atc.execute(algod, 4)
-    print(f"[OK] create_market txid: {result_atc.tx_ids[0]}")
+    # submit + our wait instead of atc.execute(): execute's confirmation loop
+    # always fetches status() first, even when the group is already confirmed.
+    # create_market returns void, so no ABI result needs decoding.
+    group_txids = atc.submit(algod)
+    wait_for_confirmation(algod, group_txids[1], wait_rounds=4)
+    print(f"[OK] Funded {MIN_BALANCE_BUFFER} microAlgos -> {app_address}")
+    print(f"[OK] create_market txid: {group_txids[1]}")
 
-    # ── Step 5: Read state ─────────────────────────────────────────────────────
+    # ── Step 4: Read state ─────────────────────────────────────────────────────
     state      = algod.application_info(app_id)["params"]["global-state"]
     state_dict = _decode_state(state)
 
@@ -292,22 +390,42 @@ def deploy_market(question: str, close_ts: int) -> dict:
         "close_ts":    close_ts,
     }
     print("\nDeployment summary:")
-    print(json.dumps(deployment, indent=2))
+    print(_json_dumps_pretty(deployment))
     return deployment
 
 
 # ── State decoder ──────────────────────────────────────────────────────────────
 
+# Global-state byte slots that hold a 32-byte account public key
+_ADDRESS_KEYS = ("creator", "multisig")
+
+# On-chain 1-byte key tag → readable name
+_STATE_KEY_NAMES = {tag: name for name, tag in STATE_KEYS.items()}
+
+
+def _state_key(raw_key: str) -> str:
+    """base64 state key → readable name (unknown keys are kept as-is)."""
+    key = a2b_base64(raw_key).decode("utf-8", errors="replace")
+    return _STATE_KEY_NAMES.get(key, key)
+
+
 def _decode_state(state: list) -> dict:
-    """Decode Algorand global state to a Python dict."""
-    result = {}
-    for item in state:
-        key = base64.b64decode(item["key"]).decode("utf-8", errors="replace")
-        val = item["value"]
-        if val["type"] == 1:  # bytes
-            result[key] = base64.b64decode(val["bytes"])
-        else:                 # uint
-            result[key] = val["uint"]
+    """
+    Decode Algorand global state to a Python dict keyed by readable names.
+    Address slots (creator, multisig) are returned as base32 addresses.
+    """
+    b64decode = a2b_base64   # local alias: skips the global lookup per item
+    result = {
+        _state_key(item["key"]): (
+            b64decode(item["value"]["bytes"]) if item["value"]["type"] == 1  # bytes
+            else item["value"]["uint"]                                        # uint
+        )
+        for item in state
+    }
+    for key in _ADDRESS_KEYS:
+        raw = result.get(key)
+        if isinstance(raw, bytes) and len(raw) == 32:
+            result[key] = algosdk.encoding.encode_address(raw)
     return result
 
 
@@ -329,7 +447,7 @@ def register_market_with_backend(deployment: dict, backend_url: str, token: str)
         "yes_asa_id": deployment["yes_asa_id"],
         "no_asa_id":  deployment["no_asa_id"],
     }
-    data = json.dumps(payload).encode()
+    data = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode()
     req  = urllib.request.Request(
         f"{backend_url}/markets/generate",
         data=data,
@@ -338,11 +456,14 @@ def register_market_with_backend(deployment: dict, backend_url: str, token: str)
     )
     try:
         with urllib.request.urlopen(req, timeout=10) as resp:
-            body = json.loads(resp.read())
+            body = _json_loads(resp.read())
             print(f"\n[OK] Market registered - backend id: {body['market']['id']}")
     except urllib.error.HTTPError as e:
         print(f"\n[WARN] Backend registration failed ({e.code}): {e.read().decode()}")
         print("       Register manually: POST /markets/generate with the deployment JSON above.")
+    except (urllib.error.URLError, TimeoutError) as e:
+        print(f"\n[WARN] Backend unreachable at {backend_url}: {getattr(e, 'reason', e)}")
+        print("       Register manually: POST /markets/generate with the deployment JSON above.")
 
 
 if __name__ == "__main__":
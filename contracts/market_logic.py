@@ -6,19 +6,21 @@ Each function returns a PyTeal Expr or Subroutine.
 
 import pyteal as pt
 from asa_utils import send_asa, burn_asa, send_algo
+from config import STATE_KEYS
 
 # ── Global state keys (shared with app.py) ────────────────────────────────────
+# 1-byte on-chain tags; see config.STATE_KEYS for the name ↔ tag mapping.
 
-KEY_QUESTION    = pt.Bytes("question")
-KEY_CLOSE_TS    = pt.Bytes("close_ts")
-KEY_YES_ASA     = pt.Bytes("yes_asa_id")
-KEY_NO_ASA      = pt.Bytes("no_asa_id")
-KEY_YES_RESERVE = pt.Bytes("yes_reserve")
-KEY_NO_RESERVE  = pt.Bytes("no_reserve")
-KEY_RESOLVED    = pt.Bytes("resolved")
-KEY_OUTCOME     = pt.Bytes("outcome")
-KEY_CREATOR     = pt.Bytes("creator")
-KEY_MULTISIG    = pt.Bytes("multisig")
+KEY_QUESTION    = pt.Bytes(STATE_KEYS["question"])
+KEY_CLOSE_TS    = pt.Bytes(STATE_KEYS["close_ts"])
+KEY_YES_ASA     = pt.Bytes(STATE_KEYS["yes_asa_id"])
+KEY_NO_ASA      = pt.Bytes(STATE_KEYS["no_asa_id"])
+KEY_YES_RESERVE = pt.Bytes(STATE_KEYS["yes_reserve"])
+KEY_NO_RESERVE  = pt.Bytes(STATE_KEYS["no_reserve"])
+KEY_RESOLVED    = pt.Bytes(STATE_KEYS["resolved"])
+KEY_OUTCOME     = pt.Bytes(STATE_KEYS["outcome"])
+KEY_CREATOR     = pt.Bytes(STATE_KEYS["creator"])
+KEY_MULTISIG    = pt.Bytes(STATE_KEYS["multisig"])
 
 
 # ── Guard helpers ─────────────────────────────────────────────────────────────
@@ -66,71 +68,41 @@ def assert_resolved() -> pt.Expr:
     )
 
 
-# ── Pricing helper ────────────────────────────────────────────────────────────
-
-@pt.Subroutine(pt.TealType.uint64)
-def compute_yes_probability() -> pt.Expr:
-    """
-    Returns yes_reserve * 10_000 / (yes_reserve + no_reserve).
-    Yields integer basis points (0–10000) to avoid floats.
-    Returns 5000 (50%) if no reserves yet.
-    """
-    yes_r = pt.App.globalGet(KEY_YES_RESERVE)
-    no_r  = pt.App.globalGet(KEY_NO_RESERVE)
-    total = yes_r + no_r
-    return pt.If(total == pt.Int(0))          \
-             .Then(pt.Int(5_000))             \
-             .Else(yes_r * pt.Int(10_000) / total)
-
-
-@pt.Subroutine(pt.TealType.uint64)
-def tokens_for_amount(amount_micro: pt.Expr) -> pt.Expr:
-    """
-    Hackathon pricing: 1:1 token issuance.
-    amount_micro microAlgos → amount_micro tokens.
-    """
-    return amount_micro
-
-
 # ── Buy logic ─────────────────────────────────────────────────────────────────
 
-def handle_buy_yes(payment_amount: pt.Expr, buyer: pt.Expr) -> pt.Expr:
+def handle_buy(
+    side: pt.Expr,
+    payment_amount: pt.Expr,
+    buyer: pt.Expr,
+) -> pt.Expr:
     """
-    Core buy-YES logic.
+    Core buy logic, shared by both sides.
+      - side           : 1 = YES, 0 = NO (validated by the caller)
       - payment_amount : microAlgos received (from preceding payment txn)
-      - buyer          : address to send YES tokens to
-    Updates yes_reserve and sends YES ASA tokens to buyer.
-    """
-    tokens = pt.ScratchVar(pt.TealType.uint64)
-    return pt.Seq(
-        assert_not_resolved(),
-        assert_trading_open(),
-        pt.Assert(payment_amount > pt.Int(0), comment="amount must be positive"),
-        tokens.store(tokens_for_amount(payment_amount)),
-        pt.App.globalPut(KEY_YES_RESERVE, pt.App.globalGet(KEY_YES_RESERVE) + payment_amount),
-        send_asa(
-            asset_id=pt.App.globalGet(KEY_YES_ASA),
-            receiver=buyer,
-            amount=tokens.load(),
-        ),
-    )
-
-
-def handle_buy_no(payment_amount: pt.Expr, buyer: pt.Expr) -> pt.Expr:
-    """
-    Core buy-NO logic. Mirror of handle_buy_yes for NO tokens.
+      - buyer          : address to send tokens to
+    Updates the side's reserve and sends the matching ASA tokens to buyer.
     """
-    tokens = pt.ScratchVar(pt.TealType.uint64)
+    reserve = pt.ScratchVar(pt.TealType.bytes)    # chosen reserve key
+    asa_id  = pt.ScratchVar(pt.TealType.uint64)   # chosen ASA ID
     return pt.Seq(
         assert_not_resolved(),
         assert_trading_open(),
         pt.Assert(payment_amount > pt.Int(0), comment="amount must be positive"),
-        tokens.store(tokens_for_amount(payment_amount)),
-        pt.App.globalPut(KEY_NO_RESERVE, pt.App.globalGet(KEY_NO_RESERVE) + payment_amount),
+        # One branch picks both the reserve key and the ASA ID
+        pt.If(side == pt.Int(1))
+        .Then(pt.Seq(
+            reserve.store(KEY_YES_RESERVE),
+            asa_id.store(pt.App.globalGet(KEY_YES_ASA)),
+        ))
+        .Else(pt.Seq(
+            reserve.store(KEY_NO_RESERVE),
+            asa_id.store(pt.App.globalGet(KEY_NO_ASA)),
+        )),
+        pt.App.globalPut(reserve.load(), pt.App.globalGet(reserve.load()) + payment_amount),
         send_asa(
-            asset_id=pt.App.globalGet(KEY_NO_ASA),
+            asset_id=asa_id.load(),
             receiver=buyer,
-            amount=tokens.load(),
+            amount=payment_amount,   # hackathon pricing: 1:1 token issuance
         ),
     )
 
@@ -151,10 +123,8 @@ def handle_resolve(outcome: pt.Expr, caller: pt.Expr) -> pt.Expr:
             pt.Global.latest_timestamp() >= pt.App.globalGet(KEY_CLOSE_TS),
             comment="market not expired yet",
         ),
-        pt.Assert(
-            pt.Or(outcome == pt.Int(0), outcome == pt.Int(1)),
-            comment="outcome must be 0 or 1",
-        ),
+        # uint64 can't be negative, so one comparison covers {0, 1}
+        pt.Assert(outcome <= pt.Int(1), comment="outcome must be 0 or 1"),
         pt.App.globalPut(KEY_RESOLVED, pt.Int(1)),
         pt.App.globalPut(KEY_OUTCOME, outcome),
     )
@@ -162,42 +132,38 @@ def handle_resolve(outcome: pt.Expr, caller: pt.Expr) -> pt.Expr:
 
 # ── Claim logic ───────────────────────────────────────────────────────────────
 
-def handle_claim(claimer: pt.Expr) -> pt.Expr:
+def handle_claim(claimer: pt.Expr, winning_asa: pt.Expr) -> pt.Expr:
     """
     Payout to winner.
-      - claimer : address claiming winnings
+      - claimer     : address claiming winnings
+      - winning_asa : YES or NO ASA ID per outcome (resolved once by the caller)
 
     Steps:
       1. Market must be resolved
-      2. Determine winning ASA (YES or NO based on outcome)
-      3. Check claimer's balance of winning ASA (asset_holding_get)
-      4. Assert balance > 0 (they hold winning tokens)
-      5. Clawback (burn) those tokens back to contract
-      6. Send ALGO payout = token_balance (1:1 hackathon model)
+      2. Check claimer's balance of winning ASA (asset_holding_get)
+      3. Assert balance > 0 (they hold winning tokens)
+      4. Clawback (burn) those tokens back to contract
+      5. Send ALGO payout = token_balance (1:1 hackathon model)
+    Evaluates to the payout in microAlgos (balance read before the burn).
     """
-    outcome     = pt.App.globalGet(KEY_OUTCOME)
-    winning_asa = pt.If(outcome == pt.Int(1))                   \
-                    .Then(pt.App.globalGet(KEY_YES_ASA))        \
-                    .Else(pt.App.globalGet(KEY_NO_ASA))
-
+    # MaybeValue is scratch-backed: .value() is a plain load, no copy needed
     balance_val = pt.AssetHolding.balance(claimer, winning_asa)
-    token_bal   = pt.ScratchVar(pt.TealType.uint64)
 
     return pt.Seq(
         assert_resolved(),
         balance_val,
         pt.Assert(balance_val.hasValue(), comment="claimer has no holding in winning ASA"),
         pt.Assert(balance_val.value() > pt.Int(0), comment="zero winning tokens held"),
-        token_bal.store(balance_val.value()),
         # Burn tokens (clawback back to contract)
         burn_asa(
             asset_id=winning_asa,
             clawback_from=claimer,
-            amount=token_bal.load(),
+            amount=balance_val.value(),
         ),
         # Pay out ALGO (1:1)
         send_algo(
             receiver=claimer,
-            amount=token_bal.load(),
+            amount=balance_val.value(),
         ),
+        balance_val.value(),
     )
@@ -1,5 +1,93 @@
+import argparse
+import contextlib
+import csv
+import sys
+from decimal import Decimal, InvalidOperation
+
 import algokit_utils
-from algosdk import util
+from algosdk import encoding, error, transaction
+
+# Atomic groups are capped at 16 transactions by the protocol
+MAX_GROUP_SIZE = 16
+
+
+class InputError(ValueError):
+    """A receiver address or ALGO amount supplied by the user is invalid."""
+
+
+def to_micro_algos(algo_amount: str) -> int:
+    """ALGO string → microAlgos, exact (float would round e.g. 0.1 down)."""
+    try:
+        micro = Decimal(algo_amount.strip()).scaleb(6)
+    except InvalidOperation:
+        raise InputError(f"amount is not a number: {algo_amount!r}") from None
+    if not micro.is_finite() or micro <= 0:
+        raise InputError(f"amount must be a positive number of ALGO: {algo_amount!r}")
+    if micro != micro.to_integral_value():
+        raise InputError(f"amount has more than 6 decimal places: {algo_amount!r}")
+    return int(micro)
+
+
+def check_address(address: str) -> str:
+    if not encoding.is_valid_address(address):
+        raise InputError(f"invalid Algorand address: {address!r}")
+    return address
+
+
+def read_batch(path: str) -> list:
+    """
+    Parse `address,amount_algo` rows from a CSV file ('-' = stdin).
+    Blank lines, `#` comments and an `address,...` header row are skipped.
+    Every row is validated before anything is sent; all bad rows are
+    reported together with their line numbers.
+    """
+    payments, errors = [], []
+    first_row = True
+    stream = contextlib.nullcontext(sys.stdin) if path == "-" else open(path, newline="")
+    with stream as f:
+        reader = csv.reader(f)
+        for row in reader:
+            cells = [cell.strip() for cell in row]
+            if not any(cells) or cells[0].startswith("#"):
+                continue
+            is_header = first_row and cells[0].lower() == "address"
+            first_row = False
+            if is_header:
+                continue
+            if len(cells) != 2:
+                errors.append(f"line {reader.line_num}: expected 'address,amount', "
+                              f"got {len(cells)} column(s)")
+                continue
+            try:
+                payments.append((check_address(cells[0]), to_micro_algos(cells[1])))
+            except InputError as e:
+                errors.append(f"line {reader.line_num}: {e}")
+    if errors:
+        raise InputError("invalid batch input:\n  " + "\n  ".join(errors))
+    return payments
+
+
+def send_batch(algod_client, sender, payments: list) -> None:
+    """Send payments as atomic groups of up to 16, each settling in one round."""
+    sp = algod_client.suggested_params()
+    for start in range(0, len(payments), MAX_GROUP_SIZE):
+        chunk = payments[start:start + MAX_GROUP_SIZE]
+        txns = transaction.assign_group_id([
+            transaction.PaymentTxn(sender=sender.address, sp=sp, receiver=addr, amt=amt)
+            for addr, amt in chunk
+        ])
+        signed = [txn.sign(sender.private_key) for txn in txns]
+        txid = algod_client.send_transactions(signed)
+        transaction.wait_for_confirmation(algod_client, txid, 4)
+        print(f"Group of {len(chunk)} confirmed (first tx: {txid})")
+        for addr, amt in chunk:
+            print(f"  {amt / 1_000_000} ALGO -> {addr}")
+
+
+parser = argparse.ArgumentParser(description="Send ALGO from the LocalNet dispenser")
+parser.add_argument("--batch", metavar="CSV",
+                    help="CSV of address,amount_algo rows ('-' reads stdin)")
+args = parser.parse_args()
 
 # 1. Setup Connection
 algod_client = algokit_utils.get_algod_client(
@@ -10,17 +98,25 @@ algod_client = algokit_utils.get_algod_client(
 sender = algokit_utils.get_localnet_default_account(algod_client)
 print(f"Sender Address: {sender.address}")
 
-# 3. User-Driven Inputs
-receiver_address = input("Enter the receiver's Algorand address: ").strip()
-algo_amount = input("Enter the amount of ALGO to send: ")
-
 try:
+    if args.batch is not None:
+        # 3a. Batch Inputs → one atomic group per 16 payments
+        payments = read_batch(args.batch)
+        if not payments:
+            sys.exit("No payments found in batch input")
+        send_batch(algod_client, sender, payments)
+        sys.exit(0)
+
+    # 3b. User-Driven Inputs
+    receiver_address = check_address(input("Enter the receiver's Algorand address: ").strip())
+    algo_amount = input("Enter the amount of ALGO to send: ")
+
     # Convert ALGO to microAlgos (10^6)
-    micro_algos = int(float(algo_amount) * 1_000_000)
+    micro_algos = to_micro_algos(algo_amount)
 
     # 4. Execute Transfer
     print(f"Sending {algo_amount} ALGO to {receiver_address}...")
-    
+
     result = algokit_utils.transfer(
         algod_client,
         algokit_utils.TransferParameters(
@@ -32,10 +128,15 @@ try:
 
     print("\n--- Transaction Successful ---")
     print(f"Transaction ID: {result.tx_id}")
-    
+
     # Check new balance
     account_info = algod_client.account_info(receiver_address)
     print(f"Receiver's new balance: {account_info.get('amount') / 1_000_000} ALGO")
 
-except Exception as e:
-    print(f"\nError: {e}")
\ No newline at end of file
+except InputError as e:
+    sys.exit(f"\nInput error: {e}")
+except OSError as e:
+    # Unreadable --batch file, or algod unreachable (URLError is an OSError)
+    sys.exit(f"\nError: {e}")
+except (error.AlgodHTTPError, error.ConfirmationTimeoutError) as e:
+    sys.exit(f"\nTransaction failed: {e}")
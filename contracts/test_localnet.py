@@ -9,6 +9,7 @@ Usage:
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Load .env
 _here = os.path.dirname(os.path.abspath(__file__))
@@ -25,17 +26,27 @@ from algosdk.v2client import algod
 from algosdk.kmd import KMDClient
 from config import ALGOD_URL, ALGOD_TOKEN, ALGOD_NETWORK, KMD_URL, KMD_TOKEN, NETWORK
 
+# Per-RPC timeout (seconds) so a stuck node fails the check fast
+PROBE_TIMEOUT = 2
+
 def test_connection():
     print(f"\n{'='*60}")
     print(f"🌐 Network: {NETWORK.upper()} ({ALGOD_NETWORK})")
     print(f"📡 Algod: {ALGOD_URL}")
     print(f"{'='*60}\n")
     
+    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
+    kmd = KMDClient(KMD_TOKEN, KMD_URL) if ALGOD_NETWORK == "local" else None
+
+    # Algod and KMD are independent services: probe both at once
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        status_future  = pool.submit(algod_client.status, timeout=PROBE_TIMEOUT)
+        wallets_future = pool.submit(kmd.list_wallets, timeout=PROBE_TIMEOUT) if kmd else None
+
     # Test Algod connection
     print("[1] Testing Algod connection...")
-    algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_URL)
     try:
-        status = algod_client.status()
+        status = status_future.result()
         print(f"✅ Connected to Algod")
         print(f"   Last round: {status['last-round']}")
         print(f"   Time since last round: {status.get('time-since-last-round', 0)}ms")
@@ -49,8 +60,7 @@ def test_connection():
         print(f"📡 KMD: {KMD_URL}")
         
         try:
-            kmd = KMDClient(KMD_TOKEN, KMD_URL)
-            wallets = kmd.list_wallets()
+            wallets = wallets_future.result()
             print(f"✅ Connected to KMD")
             print(f"   Found {len(wallets)} wallet(s)")
             
@@ -60,16 +70,16 @@ def test_connection():
                 print(f"   Wallet: {wallet['name']}")
                 
                 # Get wallet handle
-                wallet_handle = kmd.init_wallet_handle(wallet['id'], "")
+                wallet_handle = kmd.init_wallet_handle(wallet['id'], "", timeout=PROBE_TIMEOUT)
                 
                 # Get keys
-                keys = kmd.list_keys(wallet_handle)
+                keys = kmd.list_keys(wallet_handle, timeout=PROBE_TIMEOUT)
                 if keys:
                     address = keys[0]
                     print(f"   Address: {address}")
                     
                     # Check balance
-                    account_info = algod_client.account_info(address)
+                    account_info = algod_client.account_info(address, timeout=PROBE_TIMEOUT)
                     balance = account_info.get("amount", 0) / 1_000_000
                     print(f"   Balance: {balance:.6f} ALGO")
                     
@@ -80,7 +90,7 @@ def test_connection():
                 else:
                     print(f"❌ No keys found in wallet")
                 
-                kmd.release_wallet_handle(wallet_handle)
+                kmd.release_wallet_handle(wallet_handle, timeout=PROBE_TIMEOUT)
             else:
                 print(f"❌ No wallets found in KMD")
                 
@@ -7,7 +7,7 @@
  *  - Generate Algorand keypairs
  *  - AES-256-CBC encrypt / decrypt private keys
  *  - Build + sign atomic transaction groups:
- *      • buy_yes / buy_no  (payment + ABI app call)
+ *      • buy               (payment + ABI app call, side 1 = YES / 0 = NO)
  *      • claim             (ABI app call)
  *      • withdraw          (payment)
  *  - Broadcast signed transactions and wait for confirmation
@@ -172,8 +172,8 @@ export async function signBuyGroup(params: BuyGroupParams): Promise<Uint8Array[]
   sp.fee       = 2000;   // covers outer txn + 1 inner (ASA send)
   sp.flatFee   = true;
 
-  const methodName = side === 'YES' ? 'buy_yes' : 'buy_no';
-  const asaId      = side === 'YES' ? yesAsaId  : noAsaId;
+  const sideArg    = side === 'YES' ? 1        : 0;
+  const asaId      = side === 'YES' ? yesAsaId : noAsaId;
 
   // txn[0]: Payment — user → contract
   const payTxn = algosdk.makePaymentTxnWithSuggestedParamsFromObject({
@@ -183,7 +183,7 @@ export async function signBuyGroup(params: BuyGroupParams): Promise<Uint8Array[]
     suggestedParams:   { ...sp, fee: 1000 },
   });
 
-  // txn[1]: Application call — buy_yes / buy_no
+  // txn[1]: Application call — buy(side, payment)
   const appCallTxn = algosdk.makeApplicationCallTxnFromObject({
     from:            fromAddress,
     appIndex:        appId,
@@ -204,8 +204,8 @@ export async function signBuyGroup(params: BuyGroupParams): Promise<Uint8Array[]
 
   atc.addMethodCall({
     appID:       appId,
-    method:      getMethod(methodName),
-    methodArgs:  [{ txn: payTxn, signer }],   // pass pay txn as ABI arg
+    method:      getMethod('buy'),
+    methodArgs:  [sideArg, { txn: payTxn, signer }],   // pass pay txn as ABI arg
     sender:      fromAddress,
     suggestedParams: { ...sp, fee: 2000 },
     signer,